@@ -4,38 +4,144 @@ This application is instrumented with OpenTelemetry to send observability data
 to Elastic Cloud via the Managed OTLP Endpoint.
 """
 
+import contextlib
+import functools
+import gzip
 import hashlib
+import itertools
 import logging
 import os
+import platform
+import ssl
+import time
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import orjson
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from dotenv import load_dotenv
 from opentelemetry import trace, metrics
 from opentelemetry._logs import set_logger_provider  # type: ignore[import-not-found]
 from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler  # type: ignore[import-not-found]
 from opentelemetry.sdk._logs.export import BatchLogRecordProcessor  # type: ignore[import-not-found]
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter  # type: ignore[import-not-found]
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.sdk.resources import Resource, SERVICE_NAME, SERVICE_VERSION
 from opentelemetry.semconv.resource import ResourceAttributes
-from opentelemetry.instrumentation.system_metrics import SystemMetricsInstrumentor
 
-# Load environment variables from .env file
+# Load environment variables from .env file, unless running in a container
+# (IN_CONTAINER=1) where configuration comes from the runtime environment
 dotenv_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=dotenv_path)
+if os.getenv("IN_CONTAINER") != "1" and dotenv_path.exists():
+    load_dotenv(dotenv_path=dotenv_path)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid integer %r for %s, using default %d", value, name, default)
+        return default
+
 
 # Configure logging (will be connected to OpenTelemetry below)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# SHA256 throughput above this suggests OpenSSL is not using SHA-NI instructions
+# (~0.6 ns/byte with SHA-NI, ~2 ns/byte on the SSE4/AVX2 code path)
+SHA_NI_THRESHOLD_NS_PER_BYTE = 1.0
+SHA256_PROBE_RUNS = 5
+X86_MACHINES = {"x86_64", "amd64", "i386", "i686"}
+
+
+def _probe_sha256_backend() -> None:
+    """Log the OpenSSL backend behind hashlib and warn if SHA256 looks unaccelerated."""
+    payload = bytes(1024 * 1024)
+    # Warm up once, then keep the fastest of several runs so a cold cache or a busy
+    # host at startup does not look like a missing SHA-NI code path
+    hashlib.sha256(payload).digest()
+    timings_ns = []
+    for _ in range(SHA256_PROBE_RUNS):
+        start = time.perf_counter_ns()
+        hashlib.sha256(payload).digest()
+        timings_ns.append(time.perf_counter_ns() - start)
+    ns_per_byte = min(timings_ns) / len(payload)
+
+    logger.info(
+        "hashlib backend: %s, sha256 throughput: %.2f ns/byte", ssl.OPENSSL_VERSION, ns_per_byte
+    )
+    if ns_per_byte > SHA_NI_THRESHOLD_NS_PER_BYTE:
+        # OPENSSL_ia32cap only exists on x86, where it can mask the SHA-NI capability bit
+        hint = (
+            " and that OPENSSL_ia32cap does not mask it"
+            if platform.machine().lower() in X86_MACHINES
+            else ""
+        )
+        logger.warning(
+            "SHA256 throughput suggests hardware SHA acceleration is not in use. "
+            "Check that the linked OpenSSL was built with SHA extension support%s.",
+            hint,
+        )
+
+
+_probe_sha256_backend()
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C encoder and decoder."""
+
+    def _dumps_bytes(self, obj, option: int = 0, **kwargs) -> bytes:
+        # Non-str keys are stringified and datetimes go through Flask's default handler
+        # (HTTP dates), matching the stdlib-based provider
+        option |= orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        # orjson only supports 2-space indentation, which matches Flask's debug output
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option)
+        except orjson.JSONEncodeError:
+            # Fall back to the stdlib encoder for values orjson rejects, such as
+            # integers wider than 64 bits
+            text = super().dumps(obj, **kwargs)
+            return (f"{text}\n" if option & orjson.OPT_APPEND_NEWLINE else text).encode()
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize straight to bytes, skipping the str round-trip of the default provider."""
+        obj = self._prepare_response_obj(args, kwargs)
+        dump_args: Dict[str, Any] = {}
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args["indent"] = 2
+        else:
+            dump_args["separators"] = (",", ":")
+        body = self._dumps_bytes(obj, option=orjson.OPT_APPEND_NEWLINE, **dump_args)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress responses (e.g. /hash echoing large inputs); small responses are sent as-is
+# since compressing them costs more CPU than it saves in bandwidth
+app.config["COMPRESS_MIN_SIZE"] = 1024
+Compress(app)
 
 # Configure OpenTelemetry Resource with explicit telemetry SDK attributes
 # These attributes help Elastic properly identify and display the service badges
@@ -56,28 +162,110 @@ tracer_provider = trace.get_tracer_provider()
 logger_provider = LoggerProvider(resource=resource)
 set_logger_provider(logger_provider)
 
+
+class RoundRobinSpanProcessor(SpanProcessor):
+    """Span processor that distributes finished spans across a pool of processors.
+
+    A BatchSpanProcessor exports from a single worker thread, one batch at a time,
+    so a single OTLP gRPC connection caps export throughput. Giving each pooled
+    BatchSpanProcessor its own exporter, on its own connection (see
+    POOLED_CHANNEL_OPTIONS), lets batches export concurrently.
+    """
+
+    def __init__(self, processors):
+        self._processors = processors
+        # next() on itertools.count is atomic under the GIL
+        self._counter = itertools.count()
+
+    def on_start(self, span, parent_context=None) -> None:
+        pass
+
+    def on_end(self, span) -> None:
+        self._processors[next(self._counter) % len(self._processors)].on_end(span)
+
+    def shutdown(self) -> None:
+        for processor in self._processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Flush every processor, even if an earlier one fails
+        results = [processor.force_flush(timeout_millis) for processor in self._processors]
+        return all(results)
+
+
+# Channel options for pooled span exporters, so each opens its own gRPC connection
+POOLED_CHANNEL_OPTIONS = (("grpc.use_local_subchannel_pool", 1),)
+
+
 # Configure OTLP exporters - they will automatically use these environment variables:
 # - OTEL_EXPORTER_OTLP_ENDPOINT
 # - OTEL_EXPORTER_OTLP_HEADERS
+# - OTEL_EXPORTER_OTLP_COMPRESSION (defaults to gzip below, "none" disables it)
 otel_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
 if otel_endpoint:
+    # Exporters pull in gRPC and protobuf, so they are only imported when an endpoint
+    # is configured; this keeps cold start fast in demo mode
+    from opentelemetry.exporter.otlp.proto.grpc._log_exporter import (  # type: ignore[import-not-found]
+        OTLPLogExporter,
+    )
+    from opentelemetry.exporter.otlp.proto.grpc.exporter import Compression
+    from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
     logger.info(f"Configuring OTLP exporters with endpoint: {otel_endpoint}")
 
-    # Configure trace exporter with low-latency settings for demo
-    otlp_trace_exporter = OTLPSpanExporter()
-    span_processor = BatchSpanProcessor(
-        otlp_trace_exporter,
-        schedule_delay_millis=1000,  # Send every 1 second (default: 5000)
-        max_export_batch_size=128,   # Smaller batches (default: 512)
-    )
+    def _otlp_compression(signal: str) -> Optional[Compression]:
+        """Resolve the compression for one OTLP signal (TRACES, LOGS or METRICS).
+
+        OTLP payloads repeat attribute keys and values heavily, so gzip is the default
+        when neither OTEL_EXPORTER_OTLP_<SIGNAL>_COMPRESSION nor
+        OTEL_EXPORTER_OTLP_COMPRESSION is set. "none" disables compression; the gRPC
+        exporters reject it themselves. Any other value is left for the exporter to
+        parse, so invalid values fail at startup as usual.
+        """
+        signal_var = f"OTEL_EXPORTER_OTLP_{signal}_COMPRESSION"
+        value = os.environ.get(signal_var, os.environ.get("OTEL_EXPORTER_OTLP_COMPRESSION"))
+        if value is None:
+            return Compression.Gzip
+        if value.strip().lower() == "none":
+            return Compression.NoCompression
+        return None
+
+    def _build_span_processor(channel_options=None) -> BatchSpanProcessor:
+        """Build a span processor with low-latency settings, overridable via OTEL_BSP_*."""
+        return BatchSpanProcessor(
+            OTLPSpanExporter(
+                compression=_otlp_compression("TRACES"), channel_options=channel_options
+            ),
+            max_queue_size=_env_int("OTEL_BSP_MAX_QUEUE_SIZE", 4096),  # Bursts (default: 2048)
+            schedule_delay_millis=_env_int("OTEL_BSP_SCHEDULE_DELAY", 1000),  # 1s (default: 5000)
+            max_export_batch_size=_env_int("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 256),  # (default: 512)
+            export_timeout_millis=_env_int("OTEL_BSP_EXPORT_TIMEOUT", 10000),  # (default: 30000)
+        )
+
+    # OTEL_EXPORTER_OTLP_CONNECTION_POOL_SIZE > 1 exports concurrently over several
+    # connections, each with its own batch processor (and queue of max_queue_size)
+    pool_size = _env_int("OTEL_EXPORTER_OTLP_CONNECTION_POOL_SIZE", 1)
+    span_processor: SpanProcessor
+    if pool_size > 1:
+        # gRPC shares one subchannel (and so one connection) between channels with the
+        # same target and arguments; a local subchannel pool gives each its own connection
+        span_processor = RoundRobinSpanProcessor([
+            _build_span_processor(channel_options=POOLED_CHANNEL_OPTIONS)
+            for _ in range(pool_size)
+        ])
+    else:
+        span_processor = _build_span_processor()
     tracer_provider.add_span_processor(span_processor)
 
-    # Configure log exporter with low-latency settings for demo
-    otlp_log_exporter = OTLPLogExporter()
+    # Configure log exporter with low-latency settings, overridable via OTEL_BLRP_*
+    otlp_log_exporter = OTLPLogExporter(compression=_otlp_compression("LOGS"))
     log_processor = BatchLogRecordProcessor(
         otlp_log_exporter,
-        schedule_delay_millis=500,   # Send every 500ms (default: 1000)
-        max_export_batch_size=128,   # Smaller batches (default: 512)
+        max_queue_size=_env_int("OTEL_BLRP_MAX_QUEUE_SIZE", 4096),  # Absorb bursts (default: 2048)
+        schedule_delay_millis=_env_int("OTEL_BLRP_SCHEDULE_DELAY", 500),  # 500ms (default: 1000)
+        max_export_batch_size=_env_int("OTEL_BLRP_MAX_EXPORT_BATCH_SIZE", 256),  # (default: 512)
+        export_timeout_millis=_env_int("OTEL_BLRP_EXPORT_TIMEOUT", 10000),  # (default: 30000)
     )
     logger_provider.add_log_record_processor(log_processor)
 
@@ -86,7 +274,7 @@ if otel_endpoint:
     logging.getLogger().addHandler(handler)
 
     # Configure metric exporter with faster interval for demo
-    metric_exporter = OTLPMetricExporter()
+    metric_exporter = OTLPMetricExporter(compression=_otlp_compression("METRICS"))
     metric_reader = PeriodicExportingMetricReader(
         metric_exporter, export_interval_millis=10000  # Export every 10 seconds (default: 60000)
     )
@@ -103,52 +291,164 @@ else:
     metrics.set_meter_provider(meter_provider)
 
 # Instrument Flask app (must be done after MeterProvider is configured)
-FlaskInstrumentor().instrument_app(app)
+# Health checks and static assets are excluded: they are requested frequently and
+# add no value to traces. The instrumentor runs re.search over the full request URL,
+# query string included, so the patterns are anchored to the path.
+DEFAULT_EXCLUDED_URLS = [
+    r"^https?://[^/]+/health/?(\?|$)",
+    r"^https?://[^/]+/static/",
+    r"^https?://[^/]+/favicon\.ico(\?|$)",
+]
+# Exclusions configured through the standard environment variables are kept, since
+# passing excluded_urls makes the instrumentor ignore them
+excluded_urls = ",".join(filter(None, [
+    *DEFAULT_EXCLUDED_URLS,
+    os.getenv("OTEL_PYTHON_FLASK_EXCLUDED_URLS") or os.getenv("OTEL_PYTHON_EXCLUDED_URLS"),
+]))
+FlaskInstrumentor().instrument_app(app, excluded_urls=excluded_urls)
 
 # Instrument system/runtime metrics (CPU, memory, etc.)
 # Only instrument if we have a configured endpoint
 if otel_endpoint:
+    from opentelemetry.instrumentation.system_metrics import SystemMetricsInstrumentor
+
     SystemMetricsInstrumentor().instrument()
 
 # Get tracer
 tracer = trace.get_tracer(__name__)
 
+# Without an exporter, spans are never shipped anywhere, so skip creating them
+_NOOP_SPAN = contextlib.nullcontext(trace.INVALID_SPAN)
+_span_ctx = tracer.start_as_current_span if otel_endpoint else (lambda name: _NOOP_SPAN)
+
+
+# Preallocated SHA256 context; copying it is cheaper than constructing a new one
+_SHA256_BASE = hashlib.sha256()
+
+
+# Only inputs up to this many characters are memoized. lru_cache bounds the number of
+# entries, not their size, so caching arbitrarily large inputs could exhaust memory.
+SHA256_CACHE_MAX_INPUT_LENGTH = 1024
+
+
+def _compute_sha256(text: str) -> Tuple[str, int]:
+    """Return the SHA256 hex digest of text and its length in UTF-8 bytes.
+
+    hashlib.sha256 is backed by OpenSSL, which uses SHA-NI instructions when
+    available (see _probe_sha256_backend for the startup check).
+    """
+    data = text.encode()
+    hash_object = _SHA256_BASE.copy()
+    hash_object.update(data)
+    return hash_object.hexdigest(), len(data)
+
+
+_cached_sha256 = functools.lru_cache(maxsize=4096)(_compute_sha256)
+
+
+def _sha256(text: str) -> Tuple[str, int]:
+    """Return the SHA256 hex digest and UTF-8 byte length of text.
+
+    Results for short inputs are memoized for repeat requests.
+    """
+    if len(text) <= SHA256_CACHE_MAX_INPUT_LENGTH:
+        return _cached_sha256(text)
+    return _compute_sha256(text)
+
+
+# Maximum number of inputs accepted by a single /hash_batch request
+HASH_BATCH_MAX_SIZE = 1000
+
+
+def _echo_requested() -> bool:
+    """Return whether the caller wants the input echoed back (?echo=false disables it)."""
+    return request.args.get("echo", "true").lower() != "false"
+
+
+# The index template has no variables, so render it once instead of on every request
+with app.app_context():
+    _INDEX_HTML = render_template("index.html").encode("utf-8")
+# Compressed once here; Flask-Compress leaves responses that already have a
+# Content-Encoding alone, so the page is not re-gzipped per request
+_INDEX_HTML_GZIP = gzip.compress(_INDEX_HTML, compresslevel=9, mtime=0)
+
 
 @app.route("/")
 def index():
-    """Render the main page with the hash input form."""
+    """Serve the pre-rendered main page with the hash input form."""
     logger.info("Main page accessed")
-    return render_template("index.html")
+    if request.accept_encodings["gzip"]:
+        response = app.response_class(_INDEX_HTML_GZIP, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+    return app.response_class(_INDEX_HTML, mimetype="text/html")
 
 
 @app.route("/hash", methods=["POST"])
 def generate_hash():
     """Generate SHA256 hash from user input.
 
+    Pass ?echo=false to omit the original input from the response.
+
     Returns:
         JSON response with the original input and generated hash.
     """
-    with tracer.start_as_current_span("generate_hash") as span:
+    with _span_ctx("generate_hash") as span:
         # Get input from request
         data = request.get_json()
         input_text = data.get("text", "")
 
-        span.set_attribute("input.length", len(input_text))
-        masked_input = "*" * len(input_text)
-        logger.info(f"Generating hash for input: {masked_input} (length: {len(input_text)})")
+        # Generate SHA256 hash (cached for repeat inputs); the length is in UTF-8 bytes,
+        # taken from the same encoded buffer that was hashed
+        hash_hex, input_length = _sha256(input_text)
+
+        if span.is_recording():
+            span.set_attributes({"input.length": input_length, "hash.algorithm": "SHA256"})
+        # One log record per request; the input itself is never logged, and lazy
+        # %-formatting skips building the message when no handler accepts it
+        logger.info("Generated hash: %s... (input length: %d)", hash_hex[:16], input_length)
+
+        response = {"hash": hash_hex, "algorithm": "SHA256"}
+        if _echo_requested():
+            response["input"] = input_text
+        return jsonify(response)
+
+
+@app.route("/hash_batch", methods=["POST"])
+def generate_hash_batch():
+    """Generate SHA256 hashes for several inputs in one request.
+
+    Amortizes the per-request overhead (routing, JSON parsing, span export)
+    across all inputs in the batch.
+
+    Pass ?echo=false to omit the original inputs from the response.
+
+    Returns:
+        JSON response with a list of original inputs and generated hashes.
+    """
+    with _span_ctx("generate_hash_batch") as span:
+        # Get inputs from request; malformed JSON gets the same JSON error as bad input
+        data = request.get_json(silent=True)
+        texts = data.get("texts", []) if isinstance(data, dict) else None
+
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({"error": '"texts" must be a list of strings'}), 400
+        if len(texts) > HASH_BATCH_MAX_SIZE:
+            return jsonify({"error": f"At most {HASH_BATCH_MAX_SIZE} texts per batch"}), 400
+
+        if span.is_recording():
+            span.set_attributes({"batch.size": len(texts), "hash.algorithm": "SHA256"})
 
-        # Generate SHA256 hash
-        hash_object = hashlib.sha256(input_text.encode())
-        hash_hex = hash_object.hexdigest()
+        # Hash every input through the same helper as /hash; swap _sha256 for a
+        # multi-buffer SHA256 backend here to hash the batch in parallel
+        if _echo_requested():
+            results = [{"input": text, "hash": _sha256(text)[0]} for text in texts]
+        else:
+            results = [{"hash": _sha256(text)[0]} for text in texts]
 
-        span.set_attribute("hash.algorithm", "SHA256")
-        logger.info(f"Generated hash: {hash_hex[:16]}...")
+        logger.info("Generated %d hashes in batch", len(results))
 
-        return jsonify({
-            "input": input_text,
-            "hash": hash_hex,
-            "algorithm": "SHA256"
-        })
+        return jsonify({"results": results, "algorithm": "SHA256"})
 
 
 @app.route("/health")
@@ -158,5 +458,9 @@ def health():
 
 
 if __name__ == "__main__":
+    # Development server only; use gunicorn via wsgi.py in production.
+    # Debug mode is opt-in (FLASK_DEBUG=1) and the reloader stays off so the
+    # OpenTelemetry SDK is not re-imported in a forked child process.
+    flask_debug = os.getenv("FLASK_DEBUG", "0") == "1"
     logger.info("Starting Flask application on http://127.0.0.1:5000")
-    app.run(debug=True, host="127.0.0.1", port=5000)
+    app.run(debug=flask_debug, use_reloader=False, host="127.0.0.1", port=5000)
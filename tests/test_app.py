@@ -0,0 +1,137 @@
+"""Tests for the Flask SHA256 hash endpoints."""
+
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+import pytest
+from flask import json
+
+from src.app import HASH_BATCH_MAX_SIZE, app
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def sha256_hex(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class TestIndex:
+    def test_serves_precompressed_page_to_gzip_clients(self, client):
+        response = client.get("/", headers={"Accept-Encoding": "gzip, deflate"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert b"<html" in gzip.decompress(response.get_data()).lower()
+
+    def test_serves_plain_page_without_gzip(self, client):
+        response = client.get("/", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+        assert b"<html" in response.get_data().lower()
+
+
+class TestHashBatch:
+    def test_valid_batch(self, client):
+        response = client.post("/hash_batch", json={"texts": ["hello", "wörld", ""]})
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "results": [
+                {"input": "hello", "hash": sha256_hex("hello")},
+                {"input": "wörld", "hash": sha256_hex("wörld")},
+                {"input": "", "hash": sha256_hex("")},
+            ],
+            "algorithm": "SHA256",
+        }
+
+    def test_echo_false_omits_inputs(self, client):
+        response = client.post("/hash_batch?echo=false", json={"texts": ["hello"]})
+
+        assert response.status_code == 200
+        assert response.get_json()["results"] == [{"hash": sha256_hex("hello")}]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"texts": "abc"},
+            {"texts": [1]},
+            {"texts": [["a"]]},
+            {"texts": None},
+            ["abc"],
+        ],
+    )
+    def test_rejects_invalid_texts(self, client, payload):
+        response = client.post("/hash_batch", json=payload)
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_rejects_oversized_batch(self, client):
+        texts = ["a"] * (HASH_BATCH_MAX_SIZE + 1)
+        response = client.post("/hash_batch", json={"texts": texts})
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_accepts_batch_at_size_limit(self, client):
+        texts = ["a"] * HASH_BATCH_MAX_SIZE
+        response = client.post("/hash_batch?echo=false", json={"texts": texts})
+
+        assert response.status_code == 200
+        assert len(response.get_json()["results"]) == HASH_BATCH_MAX_SIZE
+
+    def test_malformed_json_returns_json_error(self, client):
+        response = client.post("/hash_batch", data="{not json", content_type="application/json")
+
+        assert response.status_code == 400
+        assert response.is_json
+        assert "error" in response.get_json()
+
+
+class TestORJSONProvider:
+    def test_response_matches_flask_contract(self):
+        with app.test_request_context():
+            response = app.json.response({"b": 1, "a": 2})
+
+        assert response.mimetype == "application/json"
+        assert response.get_data() == b'{"a":2,"b":1}\n'
+
+    def test_response_indents_in_debug_mode(self):
+        app.debug = True
+        try:
+            with app.test_request_context():
+                response = app.json.response({"a": [1]})
+        finally:
+            app.debug = False
+
+        assert response.get_data() == b'{\n  "a": [\n    1\n  ]\n}\n'
+
+    def test_response_accepts_args_and_kwargs(self):
+        with app.test_request_context():
+            assert app.json.response(1, 2).get_json() == [1, 2]
+            assert app.json.response(a=1).get_json() == {"a": 1}
+
+    def test_non_str_keys(self):
+        assert json.loads(app.json.dumps({1: "a"})) == {"1": "a"}
+
+    def test_datetime_uses_http_date(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        assert app.json.dumps(value) == '"Tue, 02 Jan 2024 03:04:05 GMT"'
+
+    def test_large_int_falls_back_to_stdlib(self):
+        assert app.json.loads(app.json.dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_large_int_response(self):
+        with app.test_request_context():
+            response = app.json.response({"n": 2**70})
+
+        assert response.get_data() == b'{"n":1180591620717411303424}\n'
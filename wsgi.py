@@ -0,0 +1,9 @@
+"""WSGI entry point for running the Flask application under a production server.
+
+Example:
+    gunicorn -w 4 -k gthread --threads 8 wsgi:app
+"""
+
+from src.app import app
+
+__all__ = ["app"]